@@ -9,109 +9,103 @@ Writes:
 
 from __future__ import annotations
 
-import csv
 import json
-import math
-from collections import defaultdict
 from typing import Dict, List
 
 import os
-import json
-from matcher import run_matching, load_csv, Anomaly, stability_overlap
+import numpy as np
+import pandas as pd
+
+from matcher import run_matching, load_csv, stability_overlap
 
 OUT_DIR = "out"
 
 
-def build_families(summary) -> List[Dict]:
+def build_families(summary) -> pd.DataFrame:
     matches = summary["matches_list"]
-    a_map = summary["a_map"]
-    b_map = summary["b_map"]
-    fams = []
-    fam_id = 0
-    for m in matches:
-        a = a_map[m["anomaly_id_2015"]]
-        b = b_map[m["anomaly_id_2022"]]
-        depth_growth = None
-        if a.depth_pct is not None and b.depth_pct is not None:
-            depth_growth = b.depth_pct - a.depth_pct
-        growth_rate = depth_growth / 7.0 if depth_growth is not None else None  # years between 2015 and 2022
-        fams.append(
-            {
-                "defect_family_id": fam_id,
-                "anomaly_id_2015": a.row_id,
-                "anomaly_id_2022": b.row_id,
-                "pos_2015": a.pos_ft,
-                "pos_2022": b.pos_ft,
-                "dx": m["dx"],
-                "clock_2015": a.clock_hr,
-                "clock_2022": b.clock_hr,
-                "depth_2015": a.depth_pct,
-                "depth_2022": b.depth_pct,
-                "depth_growth": depth_growth,
-                "depth_growth_rate_per_year": growth_rate,
-                "len_2015": a.len_in,
-                "len_2022": b.len_in,
-                "wid_2015": a.wid_in,
-                "wid_2022": b.wid_in,
-                "side_2015": a.side,
-                "side_2022": b.side,
-                "type_2015": a.type,
-                "type_2022": b.type,
-                "cost": m["cost"],
-            }
-        )
-        fam_id += 1
-    return fams
-
-
-def segment_risk(fams: List[Dict], bin_size: float = 500.0) -> List[Dict]:
-    bins = defaultdict(lambda: {"count": 0, "max_depth": -math.inf, "max_growth": -math.inf})
-    for f in fams:
-        pos = f["pos_2022"] if f["pos_2022"] is not None else f["pos_2015"]
-        if pos is None:
-            continue
-        key = math.floor(pos / bin_size) * bin_size
-        bins[key]["count"] += 1
-        if f["depth_2022"] is not None:
-            bins[key]["max_depth"] = max(bins[key]["max_depth"], f["depth_2022"])
-        if f["depth_growth"] is not None:
-            bins[key]["max_growth"] = max(bins[key]["max_growth"], f["depth_growth"])
+    a_tab = summary["a_tab"]
+    b_tab = summary["b_tab"]
+    # row_id doubles as the row index in the canonical tables, so matched
+    # rows can be gathered with np.take and all derived columns computed
+    # in one vectorized pass (NaN propagates where depth is missing).
+    a_idx = np.array([m["anomaly_id_2015"] for m in matches], dtype=np.int64)
+    b_idx = np.array([m["anomaly_id_2022"] for m in matches], dtype=np.int64)
+    depth_2015 = np.take(a_tab["depth_pct"], a_idx)
+    depth_2022 = np.take(b_tab["depth_pct"], b_idx)
+    depth_growth = depth_2022 - depth_2015
+    return pd.DataFrame(
+        {
+            "defect_family_id": np.arange(len(matches), dtype=np.int64),
+            "anomaly_id_2015": a_idx,
+            "anomaly_id_2022": b_idx,
+            "pos_2015": np.take(a_tab["pos_ft"], a_idx),
+            "pos_2022": np.take(b_tab["pos_ft"], b_idx),
+            "dx": np.array([m["dx"] for m in matches], dtype=np.float64),
+            "clock_2015": np.take(a_tab["clock_hr"], a_idx),
+            "clock_2022": np.take(b_tab["clock_hr"], b_idx),
+            "depth_2015": depth_2015,
+            "depth_2022": depth_2022,
+            "depth_growth": depth_growth,
+            "depth_growth_rate_per_year": depth_growth / 7.0,  # years between 2015 and 2022
+            "len_2015": np.take(a_tab["len_in"], a_idx),
+            "len_2022": np.take(b_tab["len_in"], b_idx),
+            "wid_2015": np.take(a_tab["wid_in"], a_idx),
+            "wid_2022": np.take(b_tab["wid_in"], b_idx),
+            "side_2015": np.take(a_tab["side"], a_idx),
+            "side_2022": np.take(b_tab["side"], b_idx),
+            "type_2015": np.take(a_tab["type"], a_idx),
+            "type_2022": np.take(b_tab["type"], b_idx),
+            "cost": np.array([m["cost"] for m in matches], dtype=np.float64),
+        }
+    )
+
+
+def segment_risk(fams: pd.DataFrame, bin_size: float = 500.0) -> List[Dict]:
+    # Vectorized binning: floor-divide positions into segments, then
+    # per-bin counts via bincount and NaN-skipping maxima via np.fmax.at.
+    pos = fams["pos_2022"].to_numpy()
+    pos = np.where(np.isnan(pos), fams["pos_2015"].to_numpy(), pos)
+    depth = fams["depth_2022"].to_numpy()
+    growth = fams["depth_growth"].to_numpy()
+    valid = ~np.isnan(pos)
+    if not valid.any():
+        return []
+    pos, depth, growth = pos[valid], depth[valid], growth[valid]
+
+    keys = np.floor(pos / bin_size) * bin_size
+    uniq, inv = np.unique(keys, return_inverse=True)
+    counts = np.bincount(inv, minlength=len(uniq))
+    max_depth = np.full(len(uniq), -np.inf)
+    np.fmax.at(max_depth, inv, depth)
+    max_growth = np.full(len(uniq), -np.inf)
+    np.fmax.at(max_growth, inv, growth)
+    score = np.where(np.isinf(max_depth), 0.0, 0.7 * max_depth) + np.where(np.isinf(max_growth), 0.0, 0.3 * max_growth)
+
     out = []
-    for k, v in bins.items():
-        max_depth = v["max_depth"] if v["max_depth"] != -math.inf else None
-        max_growth = v["max_growth"] if v["max_growth"] != -math.inf else None
-        score = 0.0
-        if max_depth is not None:
-            score += 0.7 * max_depth
-        if max_growth is not None:
-            score += 0.3 * max_growth
+    for i in np.argsort(-score, kind="stable"):
         out.append(
             {
-                "segment_start_ft": k,
-                "segment_end_ft": k + bin_size,
-                "families": v["count"],
-                "max_depth_pct": max_depth,
-                "max_growth_pct": max_growth,
-                "risk_score": score,
+                "segment_start_ft": float(uniq[i]),
+                "segment_end_ft": float(uniq[i] + bin_size),
+                "families": int(counts[i]),
+                "max_depth_pct": float(max_depth[i]) if not np.isinf(max_depth[i]) else None,
+                "max_growth_pct": float(max_growth[i]) if not np.isinf(max_growth[i]) else None,
+                "risk_score": float(score[i]),
             }
         )
-    out.sort(key=lambda x: x["risk_score"] if x["risk_score"] is not None else -math.inf, reverse=True)
     return out
 
 
 def write_csv(path: str, rows: List[Dict]):
     if not rows:
         return
-    with open(path, "w", newline="") as f:
-        w = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
-        w.writeheader()
-        for r in rows:
-            w.writerow(r)
+    # single C-backed write instead of a row-by-row DictWriter loop
+    pd.DataFrame(rows, columns=list(rows[0].keys())).to_csv(path, index=False)
 
 
 def kpis(base_summary, base_matches, probe_matches):
-    n15 = len(base_summary["a_map"])
-    n22 = len(base_summary["b_map"])
+    n15 = len(base_summary["a_tab"])
+    n22 = len(base_summary["b_tab"])
     coverage = len(base_matches) / min(n15, n22) if min(n15, n22) else 0.0
     plausibility = len(base_matches) / len(base_summary["matches_list"]) if base_summary["matches_list"] else 1.0
     stability = stability_overlap(base_matches, probe_matches)
@@ -140,7 +134,8 @@ def evaluate(config=None):
     kpi["stability"] = stab
 
     # write artifacts
-    write_csv(f"{OUT_DIR}/families.csv", fams)
+    if len(fams):
+        fams.to_csv(f"{OUT_DIR}/families.csv", index=False)
     write_csv(f"{OUT_DIR}/segment_risk.csv", segs)
     with open(f"{OUT_DIR}/kpis.json", "w") as f:
         json.dump(kpi, f, indent=2)
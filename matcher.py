@@ -8,134 +8,204 @@ Outputs: matches.csv, unmatched_2015.csv, unmatched_2022.csv (in ./out).
 
 from __future__ import annotations
 
-import csv
 import math
-from dataclasses import dataclass
-from typing import Dict, List, Tuple, Optional, Set
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Dict, List, Tuple, Optional
 
-OUT_DIR = "out"
+import numpy as np
+import pandas as pd
 
+try:
+    from scipy.optimize import linear_sum_assignment
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import min_weight_full_bipartite_matching
+except ImportError:
+    linear_sum_assignment = None  # falls back to hungarian() below
 
-@dataclass
-class Anomaly:
-    row_id: int
-    year: str
-    pos_ft: float
-    clock_hr: Optional[float]
-    side: Optional[str]
-    depth_pct: Optional[float]
-    len_in: Optional[float]
-    wid_in: Optional[float]
-    type: Optional[str]
-
-
-def load_csv(path: str) -> List[Anomaly]:
-    rows = []
-    with open(path, newline="") as f:
-        r = csv.DictReader(f)
-        for row in r:
-            rows.append(
-                Anomaly(
-                    row_id=int(row["row_id"]),
-                    year=row.get("year", ""),
-                    pos_ft=float(row["pos_ft"]),
-                    clock_hr=float(row["clock_hr"]) if row["clock_hr"] else None,
-                    side=row["side"] or None,
-                    depth_pct=float(row["depth_pct"]) if row["depth_pct"] else None,
-                    len_in=float(row["len_in"]) if row["len_in"] else None,
-                    wid_in=float(row["wid_in"]) if row["wid_in"] else None,
-                    type=row["type"] or None,
-                )
-            )
-    return rows
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 
+OUT_DIR = "out"
 
-def clock_diff(a: Optional[float], b: Optional[float]) -> Optional[float]:
-    if a is None or b is None:
-        return None
-    d = abs(a - b)
-    return min(d, 12 - d)
+# Components are solved independently; a process pool only pays off once
+# the total edge count is large enough to beat fork + pickle overhead.
+PARALLEL_MIN_EDGES = 50_000
+
+# Components whose cost matrix is at least this big and at most this dense
+# go through the sparse bipartite solver, which scales with edge count
+# rather than nA*nB.
+SPARSE_MIN_CELLS = 10_000
+SPARSE_MAX_DENSITY = 0.1
+
+
+# One contiguous buffer instead of one PyObject per anomaly. Numeric
+# fields are NaN where missing; side/type/type_key hold str or None.
+# row_id doubles as the row index (the canonical tables are generated
+# with sequential 0-based row_id).
+ANOMALY_DTYPE = np.dtype(
+    [
+        ("row_id", "i8"),
+        ("pos_ft", "f8"),
+        ("clock_hr", "f8"),
+        ("side", "O"),
+        ("depth_pct", "f8"),
+        ("len_in", "f8"),
+        ("wid_in", "f8"),
+        ("type", "O"),
+        ("type_key", "O"),
+    ]
+)
+
+
+def load_csv(path: str) -> np.ndarray:
+    # pandas parses and type-coerces in C; only empty fields count as
+    # missing (keep_default_na=False so strings like "NA" survive intact).
+    df = pd.read_csv(
+        path,
+        dtype={"row_id": "int64", "year": str, "side": str, "type": str},
+        keep_default_na=False,
+        na_values=[""],
+        float_precision="round_trip",
+    )
+    tab = np.empty(len(df), dtype=ANOMALY_DTYPE)
+    tab["row_id"] = df["row_id"].to_numpy()
+    for field in ("pos_ft", "clock_hr", "depth_pct", "len_in", "wid_in"):
+        tab[field] = df[field].to_numpy(dtype=np.float64)
+    tab["side"] = [s if isinstance(s, str) else None for s in df["side"]]
+    tab["type"] = [t if isinstance(t, str) else None for t in df["type"]]
+    tab["type_key"] = [type_norm(t) for t in tab["type"]]
+    return tab
+
+
+def build_arrays(tab: np.ndarray, side_codes: Dict[str, int], type_codes: Dict[str, int]) -> Dict[str, np.ndarray]:
+    """Expose a structured anomaly table as plain parallel arrays.
+
+    Numeric fields are views into the table's buffer; side/type become
+    integer codes (-1 for missing) so comparisons stay vectorized.
+    side_codes/type_codes are shared between the 2015/2022 calls so
+    codes line up across years.
+    """
+
+    def code(table: Dict[str, int], key: str) -> int:
+        if not key:
+            return -1
+        if key not in table:
+            table[key] = len(table)
+        return table[key]
+
+    return {
+        "row_id": tab["row_id"],
+        "pos": tab["pos_ft"],
+        "clock": tab["clock_hr"],
+        "depth": tab["depth_pct"],
+        "len": tab["len_in"],
+        "wid": tab["wid_in"],
+        "side": np.array([code(side_codes, s or "") for s in tab["side"]], dtype=np.int16),
+        "type": np.array([code(type_codes, k) for k in tab["type_key"]], dtype=np.int16),
+    }
 
 
 def type_norm(t: Optional[str]) -> str:
-    return t.strip().lower() if t else ""
+    return t.strip().casefold() if t else ""
 
 
 def generate_candidates(
-    a_rows: List[Anomaly],
-    b_rows: List[Anomaly],
+    a_arr: Dict[str, np.ndarray],
+    b_arr: Dict[str, np.ndarray],
     window: float,
     require_same_side: bool,
-) -> List[Tuple[int, int, float, Optional[float], float]]:
-    edges = []
-    b_sorted = sorted(b_rows, key=lambda x: x.pos_ft)
-    nB = len(b_sorted)
-    j = 0
-    for r in a_rows:
-        pos = r.pos_ft
-        while j < nB and b_sorted[j].pos_ft < pos - window:
-            j += 1
-        k = j
-        while k < nB and b_sorted[k].pos_ft <= pos + window:
-            r2 = b_sorted[k]
-            if require_same_side and r.side and r2.side and r.side != r2.side:
-                k += 1
-                continue
-            dx = abs(pos - r2.pos_ft)
-            dc = clock_diff(r.clock_hr, r2.clock_hr)
-            edges.append((r.row_id, r2.row_id, dx, dc, 0.0))  # cost filled later
-            k += 1
-    return edges
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Candidate edges as (a_idx, b_idx) index arrays into the SoA arrays.
+
+    Window bounds come from np.searchsorted on the sorted b positions, so
+    the whole sweep runs in vectorized C instead of a Python two-pointer
+    loop. Bounds are inclusive on both ends, matching the old sweep.
+    """
+    order = np.argsort(b_arr["pos"], kind="stable")
+    b_pos = b_arr["pos"][order]
+    a_pos = a_arr["pos"]
+    lo = np.searchsorted(b_pos, a_pos - window, side="left")
+    hi = np.searchsorted(b_pos, a_pos + window, side="right")
+    counts = hi - lo
+    a_idx = np.repeat(np.arange(len(a_pos)), counts)
+    # concatenated ranges lo[i]..hi[i] for each a-row
+    starts = np.cumsum(counts) - counts
+    b_idx = order[np.arange(counts.sum()) - np.repeat(starts - lo, counts)]
+    if require_same_side:
+        side_a = a_arr["side"][a_idx]
+        side_b = b_arr["side"][b_idx]
+        keep = ~((side_a >= 0) & (side_b >= 0) & (side_a != side_b))
+        a_idx, b_idx = a_idx[keep], b_idx[keep]
+    return a_idx, b_idx
 
 
 def compute_costs(
-    edges: List[Tuple[int, int, float, Optional[float], float]],
-    a_map: Dict[int, Anomaly],
-    b_map: Dict[int, Anomaly],
+    a_idx: np.ndarray,
+    b_idx: np.ndarray,
+    a_arr: Dict[str, np.ndarray],
+    b_arr: Dict[str, np.ndarray],
     weights: Dict[str, float],
     penalties: Dict[str, float],
-) -> List[Tuple[int, int, float, Optional[float], float]]:
-    out = []
-    for a_id, b_id, dx, dc, _ in edges:
-        a = a_map[a_id]
-        b = b_map[b_id]
-        cost = weights["dist"] * dx
-        if dc is not None:
-            cost += weights["clock"] * dc
-        if a.depth_pct is not None and b.depth_pct is not None:
-            cost += weights["depth"] * abs(a.depth_pct - b.depth_pct)
-        if a.len_in is not None and b.len_in is not None:
-            cost += weights["size"] * abs(a.len_in - b.len_in)
-        if a.wid_in is not None and b.wid_in is not None:
-            cost += weights["size"] * abs(a.wid_in - b.wid_in)
-        if a.side and b.side and a.side != b.side:
-            cost += penalties["side"]
-        if a.type and b.type and type_norm(a.type) != type_norm(b.type):
-            cost += penalties["type"]
-        out.append((a_id, b_id, dx, dc, cost))
-    return out
-
-
-# Hungarian algorithm (O(n^3))
-def hungarian(cost_matrix: List[List[float]]) -> List[int]:
-    n = len(cost_matrix)
-    u = [0.0] * (n + 1)
-    v = [0.0] * (n + 1)
-    p = [0] * (n + 1)
-    way = [0] * (n + 1)
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Vectorized edge costs: a_idx/b_idx index into the SoA arrays.
+
+    Returns (dx, dclock, cost) float64 arrays; dclock is NaN where either
+    clock is missing. Optional terms contribute 0 where a field is NaN.
+    """
+    w_dist = weights["dist"]
+    w_clock = weights["clock"]
+    w_depth = weights["depth"]
+    w_size = weights["size"]
+    p_side = penalties["side"]
+    p_type = penalties["type"]
+
+    dx = np.abs(a_arr["pos"][a_idx] - b_arr["pos"][b_idx])
+    d = np.abs(a_arr["clock"][a_idx] - b_arr["clock"][b_idx])
+    dc = np.minimum(d, 12.0 - d)
+
+    cost = w_dist * dx
+    cost += np.where(np.isnan(dc), 0.0, w_clock * dc)
+    ddepth = np.abs(a_arr["depth"][a_idx] - b_arr["depth"][b_idx])
+    cost += np.where(np.isnan(ddepth), 0.0, w_depth * ddepth)
+    dlen = np.abs(a_arr["len"][a_idx] - b_arr["len"][b_idx])
+    cost += np.where(np.isnan(dlen), 0.0, w_size * dlen)
+    dwid = np.abs(a_arr["wid"][a_idx] - b_arr["wid"][b_idx])
+    cost += np.where(np.isnan(dwid), 0.0, w_size * dwid)
+
+    side_a = a_arr["side"][a_idx]
+    side_b = b_arr["side"][b_idx]
+    cost += ((side_a >= 0) & (side_b >= 0) & (side_a != side_b)) * p_side
+    type_a = a_arr["type"][a_idx]
+    type_b = b_arr["type"][b_idx]
+    cost += ((type_a >= 0) & (type_b >= 0) & (type_a != type_b)) * p_type
+    return dx, dc, cost
+
+
+# Hungarian algorithm (O(n^3)); fallback when scipy is unavailable.
+# JIT-compiled with numba when present so the triple loop runs as native
+# code over fixed-dtype arrays instead of Python bytecode.
+def hungarian(cost_matrix: np.ndarray) -> np.ndarray:
+    n = cost_matrix.shape[0]
+    u = np.zeros(n + 1, dtype=np.float64)
+    v = np.zeros(n + 1, dtype=np.float64)
+    p = np.zeros(n + 1, dtype=np.int32)
+    way = np.zeros(n + 1, dtype=np.int32)
     for i in range(1, n + 1):
         p[0] = i
         j0 = 0
-        minv = [float("inf")] * (n + 1)
-        used = [False] * (n + 1)
+        minv = np.full(n + 1, np.inf, dtype=np.float64)
+        used = np.zeros(n + 1, dtype=np.bool_)
         while True:
             used[j0] = True
             i0 = p[j0]
-            delta = float("inf")
+            delta = np.inf
             j1 = 0
             for j in range(1, n + 1):
                 if not used[j]:
-                    cur = cost_matrix[i0 - 1][j - 1] - u[i0] - v[j]
+                    cur = cost_matrix[i0 - 1, j - 1] - u[i0] - v[j]
                     if cur < minv[j]:
                         minv[j] = cur
                         way[j] = j0
@@ -157,13 +227,17 @@ def hungarian(cost_matrix: List[List[float]]) -> List[int]:
             j0 = j1
             if j0 == 0:
                 break
-    assignment = [-1] * n
+    assignment = np.full(n, -1, dtype=np.int64)
     for j in range(1, n + 1):
         if p[j] != 0:
             assignment[p[j] - 1] = j - 1
     return assignment
 
 
+if njit is not None:
+    hungarian = njit(cache=True, fastmath=True)(hungarian)
+
+
 def stability_overlap(base_matches, probe_matches):
     base_pairs = {(m["anomaly_id_2015"], m["anomaly_id_2022"]) for m in base_matches}
     probe_pairs = {(m["anomaly_id_2015"], m["anomaly_id_2022"]) for m in probe_matches}
@@ -174,26 +248,127 @@ def stability_overlap(base_matches, probe_matches):
     return len(base_pairs & probe_pairs) / len(base_pairs | probe_pairs)
 
 
+def edge_arrays(a_ids: List[int], b_ids: List[int], edges):
+    """Convert an edge list into parallel arrays keyed by local indices.
+
+    Returns (rows, cols, keys, dx, dc, cost) where rows/cols are the local
+    row/column of each edge, keys = rows * nB + cols sorted ascending (the
+    dx/dc/cost arrays are reordered to match), so a (row, col) pair can be
+    looked up with a single searchsorted instead of a tuple-keyed dict.
+    Both id lists must be sorted, which the component builder guarantees.
+    """
+    nB = len(b_ids)
+    ne = len(edges)
+    ea = np.fromiter((e[0] for e in edges), dtype=np.int64, count=ne)
+    eb = np.fromiter((e[1] for e in edges), dtype=np.int64, count=ne)
+    dx = np.fromiter((e[2] for e in edges), dtype=np.float64, count=ne)
+    dc = np.fromiter((np.nan if e[3] is None else e[3] for e in edges), dtype=np.float64, count=ne)
+    cost = np.fromiter((e[4] for e in edges), dtype=np.float64, count=ne)
+    rows = np.searchsorted(np.asarray(a_ids, dtype=np.int64), ea)
+    cols = np.searchsorted(np.asarray(b_ids, dtype=np.int64), eb)
+    keys = rows * nB + cols
+    order = np.argsort(keys, kind="stable")
+    return rows[order], cols[order], keys[order], dx[order], dc[order], cost[order]
+
+
 def build_assignment(a_ids: List[int], b_ids: List[int], edges, cfg):
     nA, nB = len(a_ids), len(b_ids)
+    rows, cols, keys, dx, dc, cost = edge_arrays(a_ids, b_ids, edges)
+    if linear_sum_assignment is not None:
+        # Rectangular solve: no dummy rows/cols. Non-edge cells carry the
+        # unmatched penalty; anything assigned to one is reclassified as
+        # unmatched downstream because it misses the edge lookup. Safe
+        # as long as hard_limits["cost"] < unmatched_penalty, which holds
+        # for the default config.
+        if nA * nB >= SPARSE_MIN_CELLS and len(keys) <= SPARSE_MAX_DENSITY * nA * nB:
+            # Sparse solve over the candidate edges only, plus one dedicated
+            # sink column per a-row (cost = unmatched penalty) so a full
+            # matching of the rows always exists. Costs are shifted by +1
+            # because csr_matrix drops explicit zeros; the shift adds a
+            # constant nA to every full matching, so the argmin is unchanged.
+            g_rows = np.concatenate([rows, np.arange(nA)])
+            g_cols = np.concatenate([cols, np.arange(nB, nB + nA)])
+            g_data = np.concatenate([cost + 1.0, np.full(nA, cfg["unmatched_penalty"] + 1.0)])
+            graph = csr_matrix((g_data, (g_rows, g_cols)), shape=(nA, nB + nA))
+            row_ind, col_ind = min_weight_full_bipartite_matching(graph)
+            assignment = np.full(nA, -1, dtype=np.int64)
+            assignment[row_ind] = np.where(col_ind < nB, col_ind, -1)
+            return assignment, keys, dx, dc, cost
+        # float32 halves matrix bandwidth; reported match costs still come
+        # from the float64 edge arrays, so only solver-internal precision
+        # drops.
+        cost_matrix = np.full((nA, nB), cfg["unmatched_penalty"], dtype=np.float32)
+        cost_matrix[rows, cols] = cost
+        row_ind, col_ind = linear_sum_assignment(cost_matrix)
+        assignment = np.full(nA, -1, dtype=np.int64)
+        assignment[row_ind] = col_ind
+        return assignment, keys, dx, dc, cost
+    # hungarian() needs a square matrix: pad with dummy rows/cols.
     size = nA + nB if nA + nB else max(nA, nB)
-    big_m = cfg["BIG_M"]
-    cost_matrix = [[big_m] * size for _ in range(size)]
-    edge_map = {(a, b): (dx, dc, c) for a, b, dx, dc, c in edges}
-    for ri, a_id in enumerate(a_ids):
-        for cj, b_id in enumerate(b_ids):
-            if (a_id, b_id) in edge_map:
-                cost_matrix[ri][cj] = edge_map[(a_id, b_id)][2]
-        # unmatched penalty column
-        for cj in range(nB, size):
-            cost_matrix[ri][cj] = cfg["unmatched_penalty"]
-    for ri in range(nA, size):
-        for cj in range(nB):
-            cost_matrix[ri][cj] = cfg["unmatched_penalty"]
-        for cj in range(nB, size):
-            cost_matrix[ri][cj] = 0.0
+    cost_matrix = np.full((size, size), cfg["BIG_M"], dtype=np.float32)
+    cost_matrix[:nA, nB:] = cfg["unmatched_penalty"]
+    cost_matrix[nA:, :nB] = cfg["unmatched_penalty"]
+    cost_matrix[nA:, nB:] = 0.0
+    cost_matrix[rows, cols] = cost
     assignment = hungarian(cost_matrix)
-    return assignment, edge_map, size
+    return assignment, keys, dx, dc, cost
+
+
+# Solved components keyed by their exact inputs. The stability probe in
+# analytics re-runs matching with a slightly wider window; most components
+# come out identical, so their assignments can be reused verbatim.
+_component_cache: Dict[tuple, tuple] = {}
+_COMPONENT_CACHE_MAX = 100_000
+
+
+def _component_cache_key(a_ids, b_ids, comp_edges, cfg):
+    return (
+        tuple(a_ids),
+        tuple(b_ids),
+        tuple(comp_edges),
+        cfg["unmatched_penalty"],
+        cfg["BIG_M"],
+        tuple(sorted(cfg["hard_limits"].items())),
+    )
+
+
+def _solve_component(a_ids: List[int], b_ids: List[int], comp_edges, cfg):
+    """Solve one component; returns (matches, unmatched_2015, matched_2022)."""
+    matches = []
+    unmatched_2015 = []
+    matched_2022 = []
+    if not a_ids and not b_ids:
+        return matches, unmatched_2015, matched_2022
+    if not comp_edges:
+        # no candidate edges: nothing to solve, every a-row is unmatched
+        return matches, list(a_ids), matched_2022
+    if len(a_ids) == 1 and len(b_ids) == 1:
+        # 1x1 component: the only possible assignment is the single pair;
+        # the hard-limit filter below decides whether it survives
+        assignment = [0]
+        _, _, edge_keys, edge_dx, edge_dc, edge_cost = edge_arrays(a_ids, b_ids, comp_edges)
+    else:
+        assignment, edge_keys, edge_dx, edge_dc, edge_cost = build_assignment(a_ids, b_ids, comp_edges, cfg)
+    nB = len(b_ids)
+    for ri, a_id in enumerate(a_ids):
+        col = assignment[ri]
+        if 0 <= col < nB:
+            b_id = b_ids[col]
+            pos = np.searchsorted(edge_keys, ri * nB + col)
+            if pos < len(edge_keys) and edge_keys[pos] == ri * nB + col:
+                dx = float(edge_dx[pos])
+                dc = None if np.isnan(edge_dc[pos]) else float(edge_dc[pos])
+                cost = float(edge_cost[pos])
+            else:
+                dx, dc, cost = math.inf, None, cfg["BIG_M"]
+            if dx > cfg["hard_limits"]["dx"] or (dc is not None and dc > cfg["hard_limits"]["clock"]) or cost > cfg["hard_limits"]["cost"]:
+                unmatched_2015.append(a_id)
+            else:
+                matches.append({"anomaly_id_2015": a_id, "anomaly_id_2022": b_id, "dx": dx, "dclock": dc, "cost": cost})
+                matched_2022.append(b_id)
+        else:
+            unmatched_2015.append(a_id)
+    return matches, unmatched_2015, matched_2022
 
 
 def run_matching(config=None):
@@ -213,93 +388,108 @@ def run_matching(config=None):
             else:
                 cfg[k] = v
 
-    a_rows = load_csv(f"{OUT_DIR}/canonical_2015.csv")
-    b_rows = load_csv(f"{OUT_DIR}/canonical_2022.csv")
-    a_map = {r.row_id: r for r in a_rows}
-    b_map = {r.row_id: r for r in b_rows}
-
-    edges_raw = generate_candidates(a_rows, b_rows, cfg["window"], cfg["require_same_side"])
-    edges = compute_costs(edges_raw, a_map, b_map, cfg["weights"], cfg["penalties"])
-
-    # Build components to keep matrices small
-    parent: Dict[Tuple[str, int], Tuple[str, int]] = {}
-
-    def find(x):
-        parent.setdefault(x, x)
-        if parent[x] != x:
-            parent[x] = find(parent[x])
-        return parent[x]
-
-    def union(a, b):
-        ra, rb = find(a), find(b)
-        if ra != rb:
-            parent[rb] = ra
-
-    for a_id, b_id, _, _, _ in edges:
-        union(("a", a_id), ("b", b_id))
-
-    comp: Dict[Tuple[str, int], Dict[str, Set[int]]] = {}
-    for a_id, b_id, dx, dc, c in edges:
-        root = find(("a", a_id))
-        comp.setdefault(root, {"a": set(), "b": set(), "edges": []})
-        comp[root]["a"].add(a_id)
-        comp[root]["b"].add(b_id)
-        comp[root]["edges"].append((a_id, b_id, dx, dc, c))
-
-    # add isolated nodes
-    for r in a_rows:
-        node = ("a", r.row_id)
-        if node not in parent:
-            parent[node] = node
-            comp[node] = {"a": {r.row_id}, "b": set(), "edges": []}
-    for r in b_rows:
-        node = ("b", r.row_id)
-        if node not in parent:
-            parent[node] = node
-            comp[node] = {"a": set(), "b": {r.row_id}, "edges": []}
+    a_tab = load_csv(f"{OUT_DIR}/canonical_2015.csv")
+    b_tab = load_csv(f"{OUT_DIR}/canonical_2022.csv")
+
+    side_codes: Dict[str, int] = {}
+    type_codes: Dict[str, int] = {}
+    a_arr = build_arrays(a_tab, side_codes, type_codes)
+    b_arr = build_arrays(b_tab, side_codes, type_codes)
+    a_idx, b_idx = generate_candidates(a_arr, b_arr, cfg["window"], cfg["require_same_side"])
+    dx_arr, dc_arr, cost_arr = compute_costs(a_idx, b_idx, a_arr, b_arr, cfg["weights"], cfg["penalties"])
+    a_edge_ids = a_arr["row_id"][a_idx]
+    b_edge_ids = b_arr["row_id"][b_idx]
+    edges = [
+        (int(a_edge_ids[i]), int(b_edge_ids[i]), float(dx_arr[i]), None if np.isnan(dc_arr[i]) else float(dc_arr[i]), float(cost_arr[i]))
+        for i in range(len(a_idx))
+    ]
+
+    # Build components to keep matrices small. Array DSU over contiguous
+    # ids: a-rows take 0..nA-1, b-rows take nA..nA+nB-1.
+    nA, nB = len(a_tab), len(b_tab)
+    parent = np.arange(nA + nB, dtype=np.int32)
+    rank = np.zeros(nA + nB, dtype=np.int32)
+
+    def find(x: int) -> int:
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        while parent[x] != root:  # second pass: point the whole chain at root
+            parent[x], x = root, parent[x]
+        return root
+
+    def union(x: int, y: int):
+        rx, ry = find(x), find(y)
+        if rx == ry:
+            return
+        if rank[rx] < rank[ry]:
+            rx, ry = ry, rx
+        parent[ry] = rx
+        if rank[rx] == rank[ry]:
+            rank[rx] += 1
+
+    for i in range(len(a_idx)):
+        union(int(a_idx[i]), nA + int(b_idx[i]))
+
+    comp: Dict[int, Dict] = {}
+    for i, e in enumerate(edges):
+        root = find(int(a_idx[i]))
+        c = comp.setdefault(root, {"a": set(), "b": set(), "edges": []})
+        c["a"].add(e[0])
+        c["b"].add(e[1])
+        c["edges"].append(e)
+
+    # add isolated nodes (no candidate edges touch them)
+    touched = np.zeros(nA + nB, dtype=bool)
+    touched[a_idx] = True
+    touched[nA + b_idx] = True
+    for i in range(nA):
+        if not touched[i]:
+            comp[find(i)] = {"a": {int(a_arr["row_id"][i])}, "b": set(), "edges": []}
+    for i in range(nB):
+        if not touched[nA + i]:
+            comp[find(nA + i)] = {"a": set(), "b": {int(b_arr["row_id"][i])}, "edges": []}
+
+    tasks = [(sorted(cdata["a"]), sorted(cdata["b"]), cdata["edges"]) for cdata in comp.values()]
+    if len(_component_cache) > _COMPONENT_CACHE_MAX:
+        _component_cache.clear()
+    keys = [_component_cache_key(a_ids, b_ids, comp_edges, cfg) for a_ids, b_ids, comp_edges in tasks]
+    pending = [i for i, k in enumerate(keys) if k not in _component_cache]
+    if sum(len(tasks[i][2]) for i in pending) >= PARALLEL_MIN_EDGES:
+        with ProcessPoolExecutor() as pool:
+            solved = list(
+                pool.map(
+                    _solve_component,
+                    [tasks[i][0] for i in pending],
+                    [tasks[i][1] for i in pending],
+                    [tasks[i][2] for i in pending],
+                    repeat(cfg),
+                    chunksize=64,
+                )
+            )
+    else:
+        solved = [_solve_component(*tasks[i], cfg) for i in pending]
+    for i, res in zip(pending, solved):
+        _component_cache[keys[i]] = res
+    results = [_component_cache[k] for k in keys]
 
     matches = []
     unmatched_2015 = []
     matched_2022 = set()
+    for comp_matches, comp_unmatched, comp_matched_b in results:
+        matches.extend(comp_matches)
+        unmatched_2015.extend(comp_unmatched)
+        matched_2022.update(comp_matched_b)
 
-    for cdata in comp.values():
-        a_ids = sorted(list(cdata["a"]))
-        b_ids = sorted(list(cdata["b"]))
-        if not a_ids and not b_ids:
-            continue
-        assignment, edge_map, _ = build_assignment(a_ids, b_ids, cdata["edges"], cfg)
-        for ri, a_id in enumerate(a_ids):
-            col = assignment[ri]
-            if col < len(b_ids):
-                b_id = b_ids[col]
-                dx, dc, cost = edge_map.get((a_id, b_id), (math.inf, None, cfg["BIG_M"]))
-                if dx > cfg["hard_limits"]["dx"] or (dc is not None and dc > cfg["hard_limits"]["clock"]) or cost > cfg["hard_limits"]["cost"]:
-                    unmatched_2015.append(a_id)
-                else:
-                    matches.append({"anomaly_id_2015": a_id, "anomaly_id_2022": b_id, "dx": dx, "dclock": dc, "cost": cost})
-                    matched_2022.add(b_id)
-            else:
-                unmatched_2015.append(a_id)
-
-    all_2022 = set(b_map.keys())
+    all_2022 = set(int(rid) for rid in b_arr["row_id"])
     unmatched_2022 = sorted(list(all_2022 - matched_2022))
 
-    # write outputs
-    with open(f"{OUT_DIR}/matches.csv", "w", newline="") as f:
-        w = csv.DictWriter(f, fieldnames=["anomaly_id_2015", "anomaly_id_2022", "dx", "dclock", "cost"])
-        w.writeheader()
-        for m in matches:
-            w.writerow(m)
-    with open(f"{OUT_DIR}/unmatched_2015.csv", "w", newline="") as f:
-        w = csv.writer(f)
-        w.writerow(["anomaly_id_2015"])
-        for i in unmatched_2015:
-            w.writerow([i])
-    with open(f"{OUT_DIR}/unmatched_2022.csv", "w", newline="") as f:
-        w = csv.writer(f)
-        w.writerow(["anomaly_id_2022"])
-        for j in unmatched_2022:
-            w.writerow([j])
+    # write outputs (single C-backed write per file instead of row-by-row)
+    pd.DataFrame(matches, columns=["anomaly_id_2015", "anomaly_id_2022", "dx", "dclock", "cost"]).to_csv(
+        f"{OUT_DIR}/matches.csv", index=False
+    )
+    pd.DataFrame({"anomaly_id_2015": unmatched_2015}).to_csv(f"{OUT_DIR}/unmatched_2015.csv", index=False)
+    pd.DataFrame({"anomaly_id_2022": unmatched_2022}).to_csv(f"{OUT_DIR}/unmatched_2022.csv", index=False)
 
     summary = {
         "matches": len(matches),
@@ -309,8 +499,8 @@ def run_matching(config=None):
         "matches_list": matches,
         "unmatched_2015_list": unmatched_2015,
         "unmatched_2022_list": unmatched_2022,
-        "a_map": a_map,
-        "b_map": b_map,
+        "a_tab": a_tab,
+        "b_tab": b_tab,
     }
     return summary
 
@@ -10,7 +10,7 @@ Bootstrap matching engine data prep.
 
 from __future__ import annotations
 
-import csv
+import datetime
 import sys
 import xml.etree.ElementTree as ET
 from collections import OrderedDict
@@ -18,6 +18,13 @@ from dataclasses import dataclass
 from typing import List, Optional, Dict
 from zipfile import ZipFile
 
+import pandas as pd
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None  # falls back to the minimal stdlib reader below
+
 XLSX_PATH = sys.argv[1] if len(sys.argv) > 1 else "ILIDataV2.xlsx"
 NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
 
@@ -62,40 +69,88 @@ def sheet_paths(z: ZipFile) -> OrderedDict:
 
 
 def read_sheet(z: ZipFile, sheet_path: str, shared_strings: List[str]) -> List[List[str]]:
-    root = ET.fromstring(z.read(sheet_path))
+    # Stream the sheet XML with iterparse instead of materializing the
+    # whole DOM; each <row> subtree is cleared once processed, so peak
+    # memory stays at one row's worth of nodes.
     rows = []
     max_col = 0
-    for row in root.findall(f".//{NS}sheetData/{NS}row"):
-        cells = {}
-        for c in row.findall(f"{NS}c"):
-            ref = c.attrib.get("r", "")
-            col_letters = "".join(ch for ch in ref if ch.isalpha()) or "A"
-            col_idx = col_to_index(col_letters)
-            max_col = max(max_col, col_idx)
-            t = c.attrib.get("t")
-            v = c.find(f"{NS}v")
-            text = ""
-            if t == "inlineStr":
-                is_elem = c.find(f"{NS}is")
-                if is_elem is not None:
-                    text = "".join(is_elem.itertext())
-            elif v is not None and v.text is not None:
-                text = v.text
-                if t == "s":
-                    try:
-                        text = shared_strings[int(text)]
-                    except Exception:
-                        pass
-                elif t == "b":
-                    text = "TRUE" if text == "1" else "FALSE"
-            cells[col_idx] = text
-        rows.append(cells)
+    with z.open(sheet_path) as fh:
+        for _, row in ET.iterparse(fh):
+            if row.tag != f"{NS}row":
+                continue
+            cells = {}
+            for c in row.findall(f"{NS}c"):
+                ref = c.attrib.get("r", "")
+                col_letters = "".join(ch for ch in ref if ch.isalpha()) or "A"
+                col_idx = col_to_index(col_letters)
+                max_col = max(max_col, col_idx)
+                t = c.attrib.get("t")
+                v = c.find(f"{NS}v")
+                text = ""
+                if t == "inlineStr":
+                    is_elem = c.find(f"{NS}is")
+                    if is_elem is not None:
+                        text = "".join(is_elem.itertext())
+                elif v is not None and v.text is not None:
+                    text = v.text
+                    if t == "s":
+                        try:
+                            text = shared_strings[int(text)]
+                        except Exception:
+                            pass
+                    elif t == "b":
+                        text = "TRUE" if text == "1" else "FALSE"
+                cells[col_idx] = text
+            rows.append(cells)
+            row.clear()
     data = []
     for r in rows:
         data.append([r.get(i, "") for i in range(1, max_col + 1)])
     return data
 
 
+def _cell_text(val) -> str:
+    """Normalize an openpyxl cell value to the string form the stdlib
+    reader produces (times converted back to Excel day fractions)."""
+    if val is None:
+        return ""
+    if isinstance(val, bool):
+        return "TRUE" if val else "FALSE"
+    if isinstance(val, datetime.time):
+        return str((val.hour + val.minute / 60 + val.second / 3600 + val.microsecond / 3.6e9) / 24)
+    return str(val)
+
+
+def sheet_names(path: str) -> List[str]:
+    if openpyxl is not None:
+        wb = openpyxl.load_workbook(path, read_only=True)
+        try:
+            return list(wb.sheetnames)
+        finally:
+            wb.close()
+    with ZipFile(path) as z:
+        return list(sheet_paths(z).keys())
+
+
+def read_workbook_sheet(path: str, sheet: str) -> List[List[str]]:
+    """Read one sheet as rows of strings, via openpyxl's C-accelerated
+    read-only mode when available, else the minimal stdlib reader."""
+    if openpyxl is not None:
+        wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        try:
+            if sheet not in wb.sheetnames:
+                raise ValueError(f"Sheet {sheet} not found")
+            return [[_cell_text(v) for v in row] for row in wb[sheet].iter_rows(values_only=True)]
+        finally:
+            wb.close()
+    with ZipFile(path) as z:
+        shared = read_shared_strings(z)
+        sheets = sheet_paths(z)
+        if sheet not in sheets:
+            raise ValueError(f"Sheet {sheet} not found")
+        return read_sheet(z, sheets[sheet], shared)
+
+
 # -------- helpers ----------
 def to_float(val: Optional[str]) -> Optional[float]:
     if val is None:
@@ -170,12 +225,7 @@ YEAR_CONFIG = {
 
 def load_year(sheet: str, path: str) -> List[Anomaly]:
     cfg = YEAR_CONFIG[sheet]
-    with ZipFile(path) as z:
-        shared = read_shared_strings(z)
-        sheets = sheet_paths(z)
-        if sheet not in sheets:
-            raise ValueError(f"Sheet {sheet} not found")
-        data = read_sheet(z, sheets[sheet], shared)
+    data = read_workbook_sheet(path, sheet)
     headers = data[0]
     rows = data[1:]
     idx = {h: i for i, h in enumerate(headers)}
@@ -221,17 +271,12 @@ def write_csv(path: str, rows: List[Anomaly]):
         "dist_to_seam_in",
         "seam_clock_hr",
     ]
-    with open(path, "w", newline="") as f:
-        w = csv.DictWriter(f, fieldnames=fieldnames)
-        w.writeheader()
-        for r in rows:
-            w.writerow(r.__dict__)
+    pd.DataFrame([r.__dict__ for r in rows], columns=fieldnames).to_csv(path, index=False)
 
 
 def main():
     print(f"Reading workbook: {XLSX_PATH}")
-    with ZipFile(XLSX_PATH) as z:
-        sheets = list(sheet_paths(z).keys())
+    sheets = sheet_names(XLSX_PATH)
     print("Sheets found:", sheets)
     for required in ("2015", "2022"):
         if required not in sheets: